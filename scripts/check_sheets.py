@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+Google Sheets Update Monitor for Public Sheets
+
+This script checks for updates in a publicly shared Google Sheet and creates GitHub issues
+when new records are detected. Uses CSV export instead of Google Sheets API.
+"""
+
+import os
+import io
+import re
+import csv
+import json
+import argparse
+import importlib.util
+import requests
+import xxhash
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# pandas is imported inside the functions that need it so lightweight mode
+# never loads it. Use Arrow's multi-threaded CSV reader when pyarrow is available.
+if importlib.util.find_spec('pyarrow') is not None:
+    READ_CSV_OPTIONS = {'engine': 'pyarrow', 'dtype_backend': 'pyarrow'}
+else:
+    READ_CSV_OPTIONS = {}
+
+# Google Sheets CSV export URL format
+CSV_URL_TEMPLATE = "https://docs.google.com/spreadsheets/d/{spreadsheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
+
+# Shared session so the connection to docs.google.com is reused across sheets
+# and retries; also used by test_connection.py
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(max_retries=Retry(
+    total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504])))
+
+# Returned by get_sheet_data when the server reports the sheet is unchanged
+NOT_MODIFIED = object()
+
+def request_sheet_csv(spreadsheet_id, sheet_name, etag=None, last_modified=None):
+    """Open a streaming request for the sheet CSV export.
+    
+    Returns NOT_MODIFIED when the validators from the previous run still match.
+    """
+    csv_url = CSV_URL_TEMPLATE.format(spreadsheet_id=spreadsheet_id, sheet_name=sheet_name)
+    
+    # Conditional request headers from the previous run
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    
+    print(f"Fetching data from: {csv_url}")
+    response = SESSION.get(csv_url, headers=headers, timeout=30, stream=True)
+    if response.status_code == 304:
+        print("Sheet not modified since last check")
+        return NOT_MODIFIED
+    response.raise_for_status()
+    response.raw.decode_content = True
+    # urllib3 closes the stream once the body is consumed, which breaks readers
+    # such as TextIOWrapper that read again to detect the end of the data
+    response.raw.auto_close = False
+    return response
+
+def get_sheet_data(spreadsheet_id, sheet_name, etag=None, last_modified=None):
+    """Fetch data from publicly shared Google Sheet via CSV export.
+    
+    Returns a (df, etag, last_modified) tuple. When the validators from the
+    previous run still match, df is NOT_MODIFIED and nothing is downloaded.
+    """
+    import pandas as pd
+    
+    try:
+        response = request_sheet_csv(spreadsheet_id, sheet_name, etag, last_modified)
+        if response is NOT_MODIFIED:
+            return NOT_MODIFIED, etag, last_modified
+        
+        # Parse CSV data straight from the response stream
+        with response:
+            df = pd.read_csv(response.raw, **READ_CSV_OPTIONS)
+        
+        print(f"Successfully fetched {len(df)} rows from sheet")
+        return df, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching sheet data: {e}")
+        return None, None, None
+    except Exception as e:
+        print(f"Error parsing CSV data: {e}")
+        return None, None, None
+
+# Version prefix stored with the hash so state written by older hash schemes
+# is recognized as stale and triggers a single refresh
+HASH_PREFIX = 'xxh3@'
+STREAM_HASH_PREFIX = 'xxh3-csv@'
+
+def get_sheet_data_streaming(spreadsheet_id, sheet_name, etag=None, last_modified=None):
+    """Fetch and hash sheet data row by row without building a DataFrame.
+    
+    Returns a (summary, etag, last_modified) tuple like get_sheet_data, where
+    summary holds the data hash, the row count and the last row's instanceID.
+    """
+    try:
+        response = request_sheet_csv(spreadsheet_id, sheet_name, etag, last_modified)
+        if response is NOT_MODIFIED:
+            return NOT_MODIFIED, etag, last_modified
+        
+        with response:
+            reader = csv.reader(io.TextIOWrapper(response.raw, encoding='utf-8', newline=''))
+            header = next(reader, None)
+            if header is None:
+                return None, None, None
+            
+            data_hash = xxhash.xxh3_64('\x1f'.join(header).encode())
+            instance_index = header.index('instanceID') if 'instanceID' in header else None
+            row_count = 0
+            last_row = None
+            for row in reader:
+                if not row:
+                    continue
+                data_hash.update(('\x1e' + '\x1f'.join(row)).encode())
+                last_row = row
+                row_count += 1
+        
+        instance_id = None
+        if last_row is not None and instance_index is not None and instance_index < len(last_row):
+            instance_id = last_row[instance_index]
+        
+        print(f"Successfully fetched {row_count} rows from sheet")
+        summary = {
+            'hash': STREAM_HASH_PREFIX + data_hash.hexdigest(),
+            'row_count': row_count,
+            'instance_id': instance_id
+        }
+        return summary, response.headers.get('ETag'), response.headers.get('Last-Modified')
+        
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching sheet data: {e}")
+        return None, None, None
+    except Exception as e:
+        print(f"Error parsing CSV data: {e}")
+        return None, None, None
+
+# Sheets with more cells than this are hashed from a sample
+SAMPLE_HASH_CELLS = 1_000_000
+
+def calculate_data_hash(df):
+    """Calculate hash of sheet data to detect changes."""
+    import pandas as pd
+    
+    data_hash = xxhash.xxh3_64()
+    # Hash column names separately; hash_pandas_object only covers values
+    data_hash.update(repr(tuple(df.columns)).encode())
+    if df.size > SAMPLE_HASH_CELLS:
+        # Hash shape, dtypes and a deterministic sample of rows instead of every
+        # cell, as HoloViews does for large frames. An edit outside the sample
+        # that keeps the shape unchanged can go undetected; appended rows always
+        # change the shape. check_sheet still refreshes the snapshot in that
+        # case, so the missed edit is not counted as a new record later.
+        sample = df.sample(n=SAMPLE_HASH_CELLS // max(1, df.shape[1]), random_state=0)
+        data_hash.update(repr((df.shape, tuple(str(d) for d in df.dtypes))).encode())
+        df = sample
+    data_hash.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return HASH_PREFIX + data_hash.hexdigest()
+
+def empty_state():
+    """Return the state of a sheet that has not been checked yet."""
+    return {'last_hash': None, 'last_check': None, 'last_row_count': 0,
+            'etag': None, 'last_modified': None}
+
+def load_previous_state(sheet_names):
+    """Load previous state of each sheet from file."""
+    state_file = 'sheets_state.json'
+    states = {}
+    if os.path.exists(state_file):
+        try:
+            with open(state_file, 'r') as f:
+                states = json.load(f)
+            # Older state files hold a single sheet's state at the top level
+            if 'last_hash' in states:
+                states = {sheet_names[0]: states}
+        except Exception as e:
+            print(f"Error loading state file: {e}")
+            states = {}
+    
+    previous_states = {}
+    for sheet_name in sheet_names:
+        previous_states[sheet_name] = states.get(sheet_name) or empty_state()
+    return previous_states
+
+def save_state(states, last_check):
+    """Save current state of each sheet to file."""
+    state_file = 'sheets_state.json'
+    for state in states.values():
+        state['last_check'] = last_check
+    try:
+        # Write to a temporary file and swap it in so a crash never leaves a
+        # truncated state file behind
+        payload = json.dumps(states).encode()
+        tmp_file = state_file + '.tmp'
+        with open(tmp_file, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, state_file)
+    except Exception as e:
+        print(f"Error saving state file: {e}")
+
+def snapshot_file_name(sheet_name):
+    """Return the snapshot file used for a sheet."""
+    # The short hash of the raw name keeps tabs such as "Data 1" and "Data_1"
+    # from sharing a file after sanitizing
+    safe_name = re.sub(r'[^A-Za-z0-9_-]', '_', sheet_name)
+    name_hash = xxhash.xxh3_64_hexdigest(sheet_name.encode())[:8]
+    return f'sheets_prev_{safe_name}_{name_hash}.parquet'
+
+def load_previous_snapshot(sheet_name):
+    """Load the sheet data saved by the previous run, if any."""
+    import pandas as pd
+    
+    snapshot_file = snapshot_file_name(sheet_name)
+    if os.path.exists(snapshot_file):
+        try:
+            return pd.read_parquet(snapshot_file)
+        except Exception as e:
+            print(f"Error loading snapshot file: {e}")
+    return None
+
+def remove_snapshot(sheet_name):
+    """Delete the saved sheet data, if any."""
+    snapshot_file = snapshot_file_name(sheet_name)
+    try:
+        if os.path.exists(snapshot_file):
+            os.remove(snapshot_file)
+    except Exception as e:
+        print(f"Error removing snapshot file: {e}")
+
+def save_snapshot(sheet_name, df):
+    """Save current sheet data for row-level diffs on the next run."""
+    snapshot_file = snapshot_file_name(sheet_name)
+    try:
+        df.to_parquet(snapshot_file, compression='zstd')
+    except Exception as e:
+        print(f"Error saving snapshot file: {e}")
+
+def frames_equal(df, prev_df):
+    """Check whether the sheet data is identical to the previous snapshot."""
+    # DataFrame.equals treats missing cells in the same place as equal, which a
+    # plain == on pyarrow-backed columns does not (NA == NA is ambiguous).
+    # Casting restores dtypes that the Parquet round-trip may have changed.
+    if df.shape != prev_df.shape or not df.columns.equals(prev_df.columns):
+        return False
+    try:
+        return df.equals(prev_df.astype(df.dtypes))
+    except (TypeError, ValueError):
+        return False
+
+def count_new_records(df, prev_df, previous_row_count):
+    """Count rows in the sheet that were not present in the previous run."""
+    if prev_df is None or list(prev_df.columns) != list(df.columns):
+        return max(0, len(df) - previous_row_count)
+    # Dtypes are inferred per run, so a new row can change a column's type
+    # (e.g. text in a numeric column); align the snapshot before merging
+    try:
+        prev_df = prev_df.astype(df.dtypes)
+    except (TypeError, ValueError):
+        return max(0, len(df) - previous_row_count)
+    merged = df.merge(prev_df.drop_duplicates(), how='left', indicator=True)
+    return len(merged.query("_merge == 'left_only'"))
+
+def get_latest_instance_id(df, previous_row_count):
+    """Get the instanceID from the latest added row."""
+    if df is None or df.empty:
+        return None
+    
+    # Check if instanceID column exists
+    if 'instanceID' not in df.columns:
+        print("Warning: 'instanceID' column not found in sheet")
+        return None
+    
+    # Get the latest row (assuming new rows are added at the bottom)
+    current_row_count = len(df)
+    
+    if current_row_count > previous_row_count:
+        # Get the instanceID of the latest row without building the whole row
+        instance_id = df['instanceID'].iat[-1]
+        print(f"Latest instanceID: {instance_id}")
+        return str(instance_id)
+    
+    return None
+
+def unchanged_result(sheet_name, previous_state):
+    """Return the check result of a sheet with no updates, keeping its state."""
+    return {
+        'sheet_name': sheet_name,
+        'has_updates': False,
+        'new_records_count': 0,
+        'latest_instance_id': None,
+        'row_count': previous_state.get('last_row_count', 0),
+        'state': previous_state
+    }
+
+def check_sheet(spreadsheet_id, sheet_name, previous_state, with_instance_id=False, lightweight=False):
+    """Check a single sheet for updates.
+    
+    Returns a dict with the update details and the state to save for the sheet.
+    """
+    previous_row_count = previous_state.get('last_row_count', 0)
+    result = unchanged_result(sheet_name, previous_state)
+    
+    # A hash stored by an older hash scheme, or by the other mode, cannot be
+    # compared, so re-baseline on the new hash and only report rows that were
+    # actually added. The snapshot is not kept up to date in lightweight mode,
+    # so it is dropped there and ignored (then rewritten) in pandas mode.
+    last_hash = previous_state['last_hash']
+    hash_prefix = STREAM_HASH_PREFIX if lightweight else HASH_PREFIX
+    rebaseline = bool(last_hash) and not last_hash.startswith(hash_prefix)
+    if rebaseline:
+        print(f"Stored hash for sheet '{sheet_name}' uses a different format, re-baselining")
+        if lightweight:
+            remove_snapshot(sheet_name)
+    prev_df = None if lightweight or rebaseline else load_previous_snapshot(sheet_name)
+    
+    # Get current sheet data, skipping the download if it has not changed
+    fetch_sheet = get_sheet_data_streaming if lightweight else get_sheet_data
+    sheet, etag, last_modified = fetch_sheet(
+        spreadsheet_id, sheet_name,
+        etag=previous_state.get('etag'),
+        last_modified=previous_state.get('last_modified')
+    )
+    if sheet is NOT_MODIFIED:
+        return result
+    if lightweight:
+        df = None
+        if sheet is None or sheet['row_count'] == 0:
+            print(f"No data found in sheet '{sheet_name}'")
+            return result
+        current_row_count = sheet['row_count']
+        current_hash = sheet['hash']
+    else:
+        df = sheet
+        if df is None or df.empty:
+            print(f"No data found in sheet '{sheet_name}'")
+            return result
+        current_row_count = len(df)
+        
+        # Unchanged since the last snapshot: no need to hash anything
+        if prev_df is not None and frames_equal(df, prev_df):
+            print(f"Sheet '{sheet_name}' matches the previous snapshot")
+            result['row_count'] = current_row_count
+            result['state'] = dict(previous_state, last_row_count=current_row_count,
+                                   etag=etag, last_modified=last_modified)
+            return result
+        
+        current_hash = calculate_data_hash(df)
+    
+    # Check for updates
+    if rebaseline:
+        has_changes = current_row_count > previous_row_count
+    else:
+        has_changes = last_hash != current_hash
+    
+    if has_changes:
+        result['has_updates'] = True
+        print(f"Changes detected in sheet '{sheet_name}'!")
+        print(f"Previous hash: {last_hash}")
+        print(f"Current hash: {current_hash}")
+        print(f"Previous row count: {previous_row_count}")
+        print(f"Current row count: {current_row_count}")
+        
+        # Calculate new records count (all data rows on first run)
+        if lightweight or rebaseline:
+            result['new_records_count'] = max(0, current_row_count - previous_row_count)
+        else:
+            result['new_records_count'] = count_new_records(df, prev_df, previous_row_count)
+        
+        # Get the latest instanceID
+        if with_instance_id and lightweight:
+            if current_row_count > previous_row_count:
+                result['latest_instance_id'] = sheet['instance_id']
+        elif with_instance_id:
+            result['latest_instance_id'] = get_latest_instance_id(df, previous_row_count)
+    
+    # Reaching this point means the data differs from the snapshot (or there is
+    # none), even if a sampled hash did not notice, so always refresh it
+    if not lightweight:
+        save_snapshot(sheet_name, df)
+    
+    result['row_count'] = current_row_count
+    result['state'] = {
+        'last_hash': current_hash,
+        'last_check': None,
+        'last_row_count': current_row_count,
+        'etag': etag,
+        'last_modified': last_modified
+    }
+    return result
+
+def check_sheet_safely(spreadsheet_id, sheet_name, previous_state, with_instance_id=False, lightweight=False):
+    """Check a single sheet, keeping its previous state if the check fails."""
+    try:
+        return check_sheet(spreadsheet_id, sheet_name, previous_state, with_instance_id, lightweight)
+    except Exception as e:
+        print(f"Error checking sheet '{sheet_name}': {e}")
+        return unchanged_result(sheet_name, previous_state)
+
+def get_sheet_names():
+    """Return the sheet names to monitor from the SHEET_NAME environment variable."""
+    sheet_names = [name.strip() for name in os.environ.get('SHEET_NAME', 'Sheet1').split(',')
+                   if name.strip()]
+    if not sheet_names:
+        # An empty SHEET_NAME (e.g. an unset workflow secret) selects the
+        # first tab, as the export URL does without a sheet name
+        sheet_names = ['']
+    return sheet_names
+
+def main():
+    """Main function to check for sheet updates."""
+    # One timestamp per run so the state file, outputs and logs agree
+    now_iso = datetime.now().isoformat()
+    
+    parser = argparse.ArgumentParser(description="Check public Google Sheets for updates.")
+    parser.add_argument('--with-instance-id', action='store_true',
+                        help="report the instanceID of the latest added row")
+    args = parser.parse_args()
+    
+    # Get environment variables
+    spreadsheet_id = os.environ.get('GOOGLE_SHEETS_ID')
+    sheet_names = get_sheet_names()
+    
+    if not spreadsheet_id:
+        print("Error: GOOGLE_SHEETS_ID environment variable not set")
+        exit(1)
+    
+    # Lightweight mode hashes the CSV while streaming it and keeps no snapshot
+    lightweight = os.environ.get('LIGHTWEIGHT') == '1'
+    
+    # Load previous state
+    previous_states = load_previous_state(sheet_names)
+    
+    # Check all sheets concurrently; the work is dominated by network waits,
+    # and CSV parsing and hashing mostly run outside the GIL
+    with ThreadPoolExecutor(max_workers=min(8, len(sheet_names))) as executor:
+        results = list(executor.map(
+            lambda name: check_sheet_safely(spreadsheet_id, name, previous_states[name],
+                                            args.with_instance_id, lightweight),
+            sheet_names
+        ))
+    
+    # Save current state
+    save_state({result['sheet_name']: result['state'] for result in results}, now_iso)
+    
+    has_updates = any(result['has_updates'] for result in results)
+    new_records_count = sum(result['new_records_count'] for result in results)
+    latest_instance_id = next((result['latest_instance_id'] for result in reversed(results)
+                               if result['latest_instance_id']), None)
+    total_rows = sum(result['row_count'] for result in results)
+    
+    if has_updates:
+        output_lines = [
+            "has_updates=true",
+            f"new_records_count={new_records_count}",
+            f"last_check={now_iso}"
+        ]
+        if latest_instance_id:
+            output_lines.append(f"latest_instance_id={latest_instance_id}")
+    else:
+        output_lines = ["has_updates=false"]
+    
+    # Set output for GitHub Actions using environment files, in a single write
+    github_output = os.environ.get('GITHUB_OUTPUT')
+    if github_output:
+        with open(github_output, 'a') as f:
+            f.write("\n".join(output_lines) + "\n")
+    
+    # Also print for backward compatibility
+    print("\n".join(output_lines))
+    if not has_updates:
+        print("No updates detected")
+    
+    print(f"Sheet: {', '.join(sheet_names)}")
+    print(f"Total rows: {total_rows}")
+    print(f"Last check: {now_iso}")
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,11 @@ This script tests the connection to a publicly shared Google Sheet
 and verifies that the sheet is accessible.
 """
 
+import io
 import os
+import csv
 import requests
-import pandas as pd
-from io import StringIO
+from check_sheets import CSV_URL_TEMPLATE, SESSION
 
 def test_connection():
     """Test the Google Sheets connection."""
@@ -26,26 +27,33 @@ def test_connection():
     try:
         # Test sheet access
         print(f"📊 Testing access to sheet: {sheet_name}")
-        csv_url = f"https://docs.google.com/spreadsheets/d/{spreadsheet_id}/gviz/tq?tqx=out:csv&sheet={sheet_name}"
+        csv_url = CSV_URL_TEMPLATE.format(spreadsheet_id=spreadsheet_id, sheet_name=sheet_name)
         
         print(f"📡 Fetching data from: {csv_url}")
-        response = requests.get(csv_url, timeout=30)
+        response = SESSION.get(csv_url, timeout=30, stream=True)
         response.raise_for_status()
         
-        # Parse CSV data
-        csv_data = StringIO(response.text)
-        df = pd.read_csv(csv_data)
+        # Parse CSV data row by row; only the header and first row are kept
+        response.raw.decode_content = True
+        # Keep the stream open at end of body so TextIOWrapper can detect EOF
+        response.raw.auto_close = False
+        reader = csv.reader(io.TextIOWrapper(response.raw, encoding='utf-8', newline=''))
+        header = next(reader, [])
+        rows = (row for row in reader if row)
+        sample = next(rows, None)
+        row_count = sum(1 for _ in rows) + (1 if sample else 0)
+        response.close()
         
         print(f"✅ Successfully accessed sheet!")
-        print(f"📈 Found {len(df)} rows of data")
-        print(f"📋 Found {len(df.columns)} columns")
+        print(f"📈 Found {row_count} rows of data")
+        print(f"📋 Found {len(header)} columns")
         
-        if not df.empty:
+        if sample:
             print("📋 Sample data (first row):")
-            print(f"   {df.iloc[0].tolist()}")
+            print(f"   {sample}")
             
             print("📋 Column names:")
-            for i, col in enumerate(df.columns):
+            for i, col in enumerate(header):
                 print(f"   {i+1}. {col}")
         
         return True
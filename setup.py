@@ -10,16 +10,20 @@ import sys
 from pathlib import Path
 
 def run_command(command, description):
-    """Run a command and handle errors."""
+    """Run a command (given as an argument list) and handle errors."""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        result = subprocess.run(command, check=True, capture_output=True, text=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} failed:")
         print(f"   Error: {e.stderr}")
         return False
+    except FileNotFoundError as e:
+        print(f"❌ {description} failed:")
+        print(f"   Error: {e}")
+        return False
 
 def main():
     """Main setup function."""
@@ -27,12 +31,12 @@ def main():
     print("=" * 50)
     
     # Check if Python is available
-    if not run_command("python --version", "Checking Python installation"):
+    if not run_command(["python", "--version"], "Checking Python installation"):
         print("❌ Python is not available. Please install Python 3.8+ and try again.")
         return False
     
     # Install dependencies
-    if not run_command("pip install -r requirements.txt", "Installing Python dependencies"):
+    if not run_command(["pip", "install", "-r", "requirements.txt"], "Installing Python dependencies"):
         print("❌ Failed to install dependencies. Please check your pip installation.")
         return False
     
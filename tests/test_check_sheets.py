@@ -0,0 +1,155 @@
+"""Regression tests for the sheet monitor."""
+
+import io
+import json
+import sys
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).parent.parent / 'scripts'))
+
+import check_sheets
+
+
+def read_sheet(text):
+    """Parse CSV text the same way get_sheet_data does."""
+    return pd.read_csv(io.BytesIO(text.encode()), **check_sheets.READ_CSV_OPTIONS)
+
+
+class FakeResponse:
+    """Minimal stand-in for the streamed response of request_sheet_csv."""
+
+    def __init__(self, text):
+        self.raw = io.BytesIO(text.encode())
+        self.headers = {}
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def serve_sheets(monkeypatch, sheets):
+    """Make request_sheet_csv return the given CSV text for each sheet name."""
+    monkeypatch.setattr(check_sheets, 'request_sheet_csv',
+                        lambda spreadsheet_id, sheet_name, *args: FakeResponse(sheets[sheet_name]))
+
+
+def test_frames_equal_with_blank_cell_after_snapshot(tmp_path):
+    df = read_sheet("instanceID,name,val\nA1,foo,1\nA2,,2\n")
+    snapshot = tmp_path / 'snapshot.parquet'
+    df.to_parquet(snapshot, compression='zstd')
+    prev_df = pd.read_parquet(snapshot)
+
+    assert check_sheets.frames_equal(read_sheet("instanceID,name,val\nA1,foo,1\nA2,,2\n"), prev_df)
+    assert not check_sheets.frames_equal(read_sheet("instanceID,name,val\nA1,foo,1\nA2,bar,2\n"), prev_df)
+
+
+def test_count_new_records_when_appended_row_changes_dtype(tmp_path):
+    prev_df = read_sheet("instanceID,val,day\nA1,1,2024-01-01\nA2,2,2024-01-02\nA3,3,2024-01-03\n")
+    snapshot = tmp_path / 'snapshot.parquet'
+    prev_df.to_parquet(snapshot, compression='zstd')
+    prev_df = pd.read_parquet(snapshot)
+
+    df = read_sheet("instanceID,val,day\nA1,1,2024-01-01\nA2,2,2024-01-02\nA3,3,2024-01-03\nA4,pending,soon\n")
+
+    assert check_sheets.count_new_records(df, prev_df, 3) == 1
+
+
+def test_old_hash_format_rebaselines_without_reporting_updates(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    serve_sheets(monkeypatch, {'Data': "instanceID,val\nA1,1\nA2,2\n"})
+    previous_state = dict(check_sheets.empty_state(),
+                          last_hash='0cc175b9c0f1b6a831c399e269772661', last_row_count=2)
+
+    result = check_sheets.check_sheet('id', 'Data', previous_state)
+
+    assert not result['has_updates']
+    assert result['state']['last_hash'].startswith(check_sheets.HASH_PREFIX)
+
+
+def test_old_hash_format_reports_only_added_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    serve_sheets(monkeypatch, {'Data': "instanceID,val\nA1,1\nA2,2\nA3,3\n"})
+    previous_state = dict(check_sheets.empty_state(),
+                          last_hash='0cc175b9c0f1b6a831c399e269772661', last_row_count=2)
+
+    result = check_sheets.check_sheet('id', 'Data', previous_state)
+
+    assert result['has_updates']
+    assert result['new_records_count'] == 1
+
+
+def test_switching_modes_does_not_report_or_recount_rows(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    two_rows = "instanceID,val\nA1,1\nA2,2\n"
+    three_rows = two_rows + "A3,3\n"
+
+    serve_sheets(monkeypatch, {'Data': two_rows})
+    state = check_sheets.check_sheet('id', 'Data', check_sheets.empty_state())['state']
+
+    result = check_sheets.check_sheet('id', 'Data', state, lightweight=True)
+    assert not result['has_updates']
+
+    serve_sheets(monkeypatch, {'Data': three_rows})
+    result = check_sheets.check_sheet('id', 'Data', result['state'], lightweight=True)
+    assert result['has_updates']
+    assert result['new_records_count'] == 1
+
+    result = check_sheets.check_sheet('id', 'Data', result['state'])
+    assert not result['has_updates']
+    assert result['state']['last_hash'].startswith(check_sheets.HASH_PREFIX)
+
+
+def test_load_previous_state_migrates_single_sheet_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    old_state = {'last_hash': 'xxh3@0123456789abcdef', 'last_check': None, 'last_row_count': 5}
+    (tmp_path / 'sheets_state.json').write_text(json.dumps(old_state))
+
+    states = check_sheets.load_previous_state(['Data', 'Other'])
+
+    assert states['Data'] == old_state
+    assert states['Other'] == check_sheets.empty_state()
+
+
+def test_load_previous_state_reads_per_sheet_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    data_state = dict(check_sheets.empty_state(), last_hash='xxh3@0123456789abcdef', last_row_count=5)
+    (tmp_path / 'sheets_state.json').write_text(json.dumps({'Data': data_state}))
+
+    assert check_sheets.load_previous_state(['Data'])['Data'] == data_state
+
+
+def test_empty_sheet_name_falls_back_to_first_tab(monkeypatch):
+    monkeypatch.setenv('SHEET_NAME', '')
+    assert check_sheets.get_sheet_names() == ['']
+
+    monkeypatch.setenv('SHEET_NAME', 'Data, Other ,')
+    assert check_sheets.get_sheet_names() == ['Data', 'Other']
+
+
+def test_failing_sheet_keeps_previous_state(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    serve_sheets(monkeypatch, {'Good': "instanceID,val\nA1,1\n", 'Bad': "instanceID,val\nB1,1\n"})
+    load_snapshot = check_sheets.load_previous_snapshot
+
+    def failing_snapshot(sheet_name):
+        if sheet_name == 'Bad':
+            raise OSError("disk error")
+        return load_snapshot(sheet_name)
+
+    monkeypatch.setattr(check_sheets, 'load_previous_snapshot', failing_snapshot)
+    bad_state = dict(check_sheets.empty_state(), last_hash='xxh3@0123456789abcdef', last_row_count=7)
+
+    bad = check_sheets.check_sheet_safely('id', 'Bad', bad_state)
+    good = check_sheets.check_sheet_safely('id', 'Good', check_sheets.empty_state())
+
+    assert not bad['has_updates']
+    assert bad['state'] is bad_state
+    assert good['has_updates']
+    assert good['new_records_count'] == 1